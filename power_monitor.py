@@ -4,20 +4,141 @@ Mac Power Monitor - A real-time terminal visualizer for power in/out on macOS.
 Features threaded data collection for an ultra-smooth htop-like experience.
 """
 
+import copy
 import subprocess
 import re
+import plistlib
+import select
 import time
 import sys
 import os
 import signal
+import zlib
 import curses
 import threading
 from datetime import datetime
 from collections import deque
 
+# Optional: with NumPy the power history becomes a preallocated ring
+# buffer with vectorized max/quantize for the sparkline. Not required.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: with Numba on top of NumPy the sparkline quantizer is JIT
+# compiled to machine code (cached on disk across runs). Not required.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if np is not None and njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _quantize_jit(buf, n, inv):
+        out = np.empty(n, np.int8)
+        for i in range(n):
+            b = int(buf[i] * inv)
+            out[i] = 7 if b > 7 else b
+        return out
+else:
+    _quantize_jit = None
+
+# Optional fast path: read AppleSmartBattery straight out of the IOKit
+# registry (one in-process call, native dict back) instead of forking
+# `ioreg` and re-parsing its text dump. pyobjc is not required — without
+# it we simply keep the subprocess path.
+try:
+    import objc
+    from Foundation import NSBundle
+
+    _iokit_fns = {}
+    objc.loadBundleFunctions(
+        NSBundle.bundleWithIdentifier_('com.apple.framework.IOKit'),
+        _iokit_fns,
+        [
+            ('IOServiceGetMatchingService', b'II@'),
+            ('IOServiceMatching', b'@*'),
+            ('IORegistryEntryCreateCFProperties', b'iIo^@@I'),
+            ('IORegistryEntryCreateCFProperty', b'@I@@I'),
+            ('IOObjectRelease', b'iI'),
+        ],
+    )
+    IOServiceGetMatchingService = _iokit_fns['IOServiceGetMatchingService']
+    IOServiceMatching = _iokit_fns['IOServiceMatching']
+    IORegistryEntryCreateCFProperties = _iokit_fns['IORegistryEntryCreateCFProperties']
+    IORegistryEntryCreateCFProperty = _iokit_fns['IORegistryEntryCreateCFProperty']
+    IOObjectRelease = _iokit_fns['IOObjectRelease']
+    _HAS_IOKIT = True
+except Exception:
+    _HAS_IOKIT = False
+
+
+# Precompiled patterns for ioreg/pmset output. Compiling once at import time
+# keeps the per-poll hot path free of regex cache lookups. run_command returns
+# raw bytes, so these are bytes patterns (no decode needed before matching).
+# AdapterDetails keeps a regex because its value is a nested {...} literal;
+# every other field is a fixed-format '"Key" = value' line handled by the
+# single-pass tokenizer below.
+_PAT_ADAPTER = re.compile(rb'"(?:AppleRaw)?AdapterDetails"\s*=\s*\{([^}]+)\}')
+_PAT_AD_FIELDS = re.compile(rb'[ ,{]"?(AdapterVoltage|Current|Watts)"?\s*[:=]\s*(\d+)')
+_PAT_CONDITION = re.compile(rb'Condition:\s*(\w+)')
+_PAT_LPM = re.compile(rb'lowpowermode\s+(\d)')
+
+# ioreg keys the tokenizer cares about. The tokenizer produces the same
+# key names (and Python value types) as the IOKit registry dict, so both
+# collection paths feed one publish step.
+_IOREG_KEYS = {
+    b'"CurrentCapacity"': 'CurrentCapacity',
+    b'"MaxCapacity"': 'MaxCapacity',
+    b'"TimeRemaining"': 'TimeRemaining',
+    b'"Temperature"': 'Temperature',
+    b'"Voltage"': 'Voltage',
+    b'"InstantAmperage"': 'InstantAmperage',
+    b'"Amperage"': 'Amperage',
+    b'"CycleCount"': 'CycleCount',
+    b'"DesignCapacity"': 'DesignCapacity',
+    b'"AppleRawMaxCapacity"': 'AppleRawMaxCapacity',
+    b'"ExternalConnected"': 'ExternalConnected',
+    b'"AppleRawExternalConnected"': 'AppleRawExternalConnected',
+    b'"IsCharging"': 'IsCharging',
+    b'"FullyCharged"': 'FullyCharged',
+    b'"PermanentFailureStatus"': 'PermanentFailureStatus',
+}
+_IOREG_BOOLS = frozenset((
+    'ExternalConnected', 'AppleRawExternalConnected', 'IsCharging', 'FullyCharged',
+))
+
+# Two's-complement bounds for the 64-bit unsigned amperage the registry
+# reports while discharging
+_AMP_SIGN = 2 ** 63
+_AMP_WRAP = 2 ** 64
+
+# Render-path constants. The color-pair attributes are resolved once in
+# main_loop (right after init_pair) so the draw code doesn't dispatch into
+# _curses for every cell; static strings are built once here.
+_CP1 = _CP2 = _CP3 = _CP4 = _CP5 = _CP6 = _CP8 = 0
+_BOLD = curses.A_BOLD
+_FOOTER = " [P]erf | [B]alanced | [E]co | 'q' to quit  "
+_SPARK_CHARS = (' ', '▂', '▃', '▄', '▅', '▆', '▇', '█')
+
 
 class PowerData:
     """Stores power-related data from various sources"""
+    # Slots keep attribute access a fixed C-level offset (no per-instance
+    # __dict__), which matters given how densely both threads hit these
+    __slots__ = (
+        'power_source', 'battery_percent', 'charging_status', 'time_remaining',
+        'cycle_count', 'condition', 'max_capacity_percent', 'charger_wattage',
+        'charger_connected', 'fully_charged', 'is_active_charge', 'low_power_mode', 'temperature',
+        'voltage', 'amperage', 'power_watts',
+        'adapter_voltage', 'adapter_current', 'adapter_watts', 'serial',
+        'design_capacity', 'current_capacity',
+        'mode', 'poll_interval',
+        'power_history', 'power_history_n', 'temp_history',
+        'last_update_time', 'poll_latency', 'version',
+    )
+
     def __init__(self):
         self.power_source = 'Unknown'
         self.battery_percent = 0
@@ -29,6 +150,9 @@ class PowerData:
         self.charger_wattage = 0
         self.charger_connected = False
         self.fully_charged = False
+        # Plain bool published by the collector; reading it is atomic in
+        # CPython, so the animation can poll it without taking the lock
+        self.is_active_charge = False
         self.low_power_mode = False
         self.temperature = 0
         self.voltage = 0
@@ -47,166 +171,371 @@ class PowerData:
         self.mode = "BALANCED"
         self.poll_interval = 2.0
         
-        # History for graphs
-        self.power_history = deque(maxlen=100)
+        # History for graphs: NumPy ring buffer when available (contiguous,
+        # vectorized), deque otherwise. power_history_n counts total samples.
+        if np is not None:
+            self.power_history = np.zeros(100, dtype=np.float32)
+        else:
+            self.power_history = deque(maxlen=100)
+        self.power_history_n = 0
         self.temp_history = deque(maxlen=100)
         
         # Metadata
         self.last_update_time = 0
         self.poll_latency = 0
+        # Bumped (under lock) whenever fields change, so the UI can skip
+        # redrawing static content between data updates
+        self.version = 0
+
+    def snapshot(self):
+        """Shallow copy for rendering outside the lock; the histories are
+        copied so the collector can keep appending."""
+        snap = copy.copy(self)
+        if np is not None:
+            snap.power_history = self.power_history.copy()
+        else:
+            snap.power_history = tuple(self.power_history)
+        snap.temp_history = tuple(self.temp_history)
+        return snap
+
+    def append_power(self, watts):
+        """Record a power sample in the history ring."""
+        if np is not None:
+            self.power_history[self.power_history_n % 100] = watts
+        else:
+            self.power_history.append(watts)
+        self.power_history_n += 1
+
+    def power_history_ordered(self):
+        """History in oldest-to-newest order, sized to the samples taken."""
+        if np is not None:
+            n = self.power_history_n
+            if n < 100:
+                return self.power_history[:n]
+            return np.roll(self.power_history, -(n % 100))
+        return self.power_history
 
 
 class DataCollector(threading.Thread):
     """Background thread for non-blocking data collection"""
-    def __init__(self, data_obj, lock):
+    def __init__(self, data_obj, lock, wake_fd=None):
         super().__init__()
         self.data = data_obj
         self.lock = lock
         self.daemon = True
         self.running = True
         self.last_slow_check = 0
+        # UI wake pipe: one byte written after each publish so the render
+        # loop can sleep in select() instead of polling
+        self.wake_fd = wake_fd
+        # CRC of the last ioreg dump + its parsed form: identical output
+        # (common on steady-state battery) skips the tokenize pass
+        self._last_ioreg_crc = None
+        self._last_ioreg_props = None
+        # Long-lived ioreg helper (PERFORMANCE mode only), see _ioreg_dump
+        self._ioreg_proc = None
+        # Set by the UI to cut the poll sleep short (mode change, quit)
+        self._wake = threading.Event()
+
+    def wake(self):
+        """Interrupt the current poll sleep (e.g. after a mode change)."""
+        self._wake.set()
+
+    def notify_ui(self):
+        if self.wake_fd is not None:
+            try:
+                os.write(self.wake_fd, b'1')
+            except OSError:
+                pass
 
     def run_command(self, cmd_args):
         try:
-            # Security: Use shell=False and pass arguments as a list
-            result = subprocess.run(cmd_args, capture_output=True, text=True, timeout=5, shell=False)
+            # Security: Use shell=False and pass arguments as a list.
+            # Returns raw bytes so the precompiled patterns match directly.
+            result = subprocess.run(cmd_args, capture_output=True, timeout=5, shell=False)
             return result.stdout
         except Exception:
-            return ""
+            return b""
+
+    def collect_iokit(self):
+        """Fetch AppleSmartBattery properties as a native dict via IOKit."""
+        try:
+            service = IOServiceGetMatchingService(0, IOServiceMatching(b"AppleSmartBattery"))
+            if not service:
+                return None
+            err, props = IORegistryEntryCreateCFProperties(service, None, None, 0)
+            IOObjectRelease(service)
+            if err or props is None:
+                return None
+            return props
+        except Exception:
+            return None
+
+    # One shell that re-runs ioreg on demand: newline in -> one dump plus a
+    # sentinel out. Saves a fork+exec+dyld per poll, which is visible at
+    # PERFORMANCE cadence (0.5s).
+    _IOREG_HELPER = ['/bin/sh', '-c',
+                     'while read -r _; do ioreg -w0 -rn AppleSmartBattery; echo __END__; done']
+
+    def _close_ioreg_helper(self):
+        if self._ioreg_proc is not None:
+            try:
+                self._ioreg_proc.kill()
+            except Exception:
+                pass
+            self._ioreg_proc = None
+
+    def _ioreg_dump(self):
+        """One registry dump from the persistent helper, respawning it if it
+        died; returns None so the caller can fall back to a one-shot run."""
+        try:
+            if self._ioreg_proc is None or self._ioreg_proc.poll() is not None:
+                self._ioreg_proc = subprocess.Popen(
+                    self._IOREG_HELPER, stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            proc = self._ioreg_proc
+            proc.stdin.write(b'\n')
+            proc.stdin.flush()
+            chunks = []
+            for line in proc.stdout:
+                if line == b'__END__\n':
+                    return b''.join(chunks)
+                chunks.append(line)
+            # EOF before the sentinel: helper exited mid-dump
+            self._close_ioreg_helper()
+            return None
+        except Exception:
+            self._close_ioreg_helper()
+            return None
+
+    def collect_ioreg(self):
+        """Fallback: run ioreg and tokenize its dump into a props-shaped dict."""
+        # ioreg -w0 -rn AppleSmartBattery contains 95% of what we need.
+        # In PERFORMANCE mode the dump comes from the persistent helper.
+        ioreg_out = None
+        if self.data.mode == "PERFORMANCE":
+            ioreg_out = self._ioreg_dump()
+        else:
+            self._close_ioreg_helper()
+        if ioreg_out is None:
+            ioreg_out = self.run_command(["ioreg", "-w0", "-rn", "AppleSmartBattery"])
+
+        # Byte-identical dump means every field (including the live ones)
+        # is unchanged, so the cached parse is still exact
+        crc = zlib.crc32(ioreg_out)
+        if crc == self._last_ioreg_crc and self._last_ioreg_props is not None:
+            return self._last_ioreg_props
+
+        # Tokenize in a single pass: one linear scan of the dump instead
+        # of a full-text search per field.
+        props = {}
+        for line in ioreg_out.splitlines():
+            key, sep, val = line.partition(b'=')
+            if sep:
+                name = _IOREG_KEYS.get(key.strip())
+                if name:
+                    v = val.strip()
+                    props[name] = (v == b'Yes') if name in _IOREG_BOOLS else int(v)
+
+        # AdapterDetails is a nested {...} literal, handled separately.
+        # One alternation pattern walks the dict body once for all three
+        # fields (group names match the IOKit property keys).
+        ad_match = _PAT_ADAPTER.search(ioreg_out)
+        if ad_match:
+            adapter = {}
+            for m in _PAT_AD_FIELDS.finditer(ad_match.group(0)):
+                adapter[m.group(1).decode()] = int(m.group(2))
+            props['AdapterDetails'] = adapter
+
+        self._last_ioreg_crc = crc
+        self._last_ioreg_props = props
+        return props
+
+    def publish(self, props, t0):
+        """Push a batch of battery properties into the shared PowerData."""
+        with self.lock:
+            # Basic Source & Connection
+            ext_conn = bool(props.get('ExternalConnected') or props.get('AppleRawExternalConnected'))
+            self.data.power_source = 'AC Power' if ext_conn else 'Battery'
+            self.data.charger_connected = ext_conn
+
+            # Percentage
+            if 'CurrentCapacity' in props and 'MaxCapacity' in props:
+                self.data.battery_percent = int(props['CurrentCapacity'])
+
+            # Charging Status
+            is_charging = bool(props.get('IsCharging'))
+            fully_charged = bool(props.get('FullyCharged'))
+            if fully_charged: self.data.charging_status = 'Fully Charged'
+            elif is_charging: self.data.charging_status = 'Charging'
+            else: self.data.charging_status = 'Discharging' if not ext_conn else 'Connected'
+
+            # Time Remaining
+            if 'TimeRemaining' in props:
+                mins = int(props['TimeRemaining'])
+                if mins == 65535: self.data.time_remaining = "Calculating..."
+                else: self.data.time_remaining = f"{mins // 60}h {mins % 60}m"
+
+            # Temperature (deciKelvin)
+            if 'Temperature' in props:
+                self.data.temperature = round((int(props['Temperature']) / 10) - 273.15, 1)
+
+            # Voltage & Amperage (InstantAmperage preferred)
+            if 'Voltage' in props:
+                self.data.voltage = int(props['Voltage']) / 1000
+
+            amp_raw = props.get('InstantAmperage')
+            if amp_raw is None:
+                amp_raw = props.get('Amperage')
+            if amp_raw is not None:
+                amp = int(amp_raw)
+                if amp > _AMP_SIGN: amp -= _AMP_WRAP
+                self.data.amperage = amp
+
+            self.data.power_watts = round(self.data.voltage * abs(self.data.amperage) / 1000, 2)
+            self.data.append_power(self.data.power_watts)
+            self.data.is_active_charge = is_charging or self.data.amperage > 50
+
+            # Health & Cycles
+            if 'CycleCount' in props:
+                self.data.cycle_count = int(props['CycleCount'])
+            if 'DesignCapacity' in props:
+                self.data.design_capacity = int(props['DesignCapacity'])
+            if 'AppleRawMaxCapacity' in props:
+                self.data.current_capacity = int(props['AppleRawMaxCapacity'])
+                if self.data.design_capacity > 0:
+                    self.data.max_capacity_percent = round((self.data.current_capacity / self.data.design_capacity) * 100, 1)
+
+            # Charger Details
+            adapter = props.get('AdapterDetails') or props.get('AppleRawAdapterDetails')
+            if adapter:
+                if 'AdapterVoltage' in adapter: self.data.adapter_voltage = int(adapter['AdapterVoltage']) / 1000
+                if 'Current' in adapter: self.data.adapter_current = int(adapter['Current'])
+                if 'Watts' in adapter: self.data.charger_wattage = int(adapter['Watts'])
+
+            # Update metadata
+            self.data.poll_latency = (time.monotonic_ns() - t0) // 1_000_000
+            self.data.version += 1
+
+    def read_condition(self, props):
+        """Derive battery condition from the registry properties we already
+        fetched, using the same rules system_profiler applies. Shells out to
+        the (very slow) system_profiler only when the keys are absent."""
+        batt_data = props.get('BatteryData')
+        if batt_data and 'Condition' in batt_data:
+            return str(batt_data['Condition'])
+        if 'PermanentFailureStatus' in props:
+            return 'Normal' if not props['PermanentFailureStatus'] else 'Service Recommended'
+        # Older Macs: fall back to the system_profiler report
+        prof_out = self.run_command(["system_profiler", "SPPowerDataType"])
+        match = _PAT_CONDITION.search(prof_out)
+        return match.group(1).decode() if match else None
+
+    def read_low_power_mode(self):
+        """Read the Low Power Mode flag: IOPMrootDomain registry property
+        when IOKit is available, else the PowerManagement preferences plist,
+        else `pmset -g`."""
+        if _HAS_IOKIT:
+            try:
+                service = IOServiceGetMatchingService(0, IOServiceMatching(b"IOPMrootDomain"))
+                if service:
+                    val = IORegistryEntryCreateCFProperty(service, "LowPowerMode", None, 0)
+                    IOObjectRelease(service)
+                    if val is not None:
+                        return bool(int(val))
+            except Exception:
+                pass
+        try:
+            with open('/Library/Preferences/com.apple.PowerManagement.plist', 'rb') as f:
+                prefs = plistlib.load(f)
+            for profile in prefs.values():
+                if isinstance(profile, dict) and 'LowPowerMode' in profile:
+                    return str(profile['LowPowerMode']) == '1'
+        except Exception:
+            pass
+        lpm_out = self.run_command(["pmset", "-g"])
+        lpm_match = _PAT_LPM.search(lpm_out)
+        return (lpm_match.group(1) == b'1') if lpm_match else False
 
     def run(self):
         while self.running:
-            start_time = time.time()
-            
-            # 1. Collect Data - Consolidate to ONE fast shell call if possible
-            # ioreg -w0 -rn AppleSmartBattery contains 95% of what we need
-            ioreg_out = self.run_command(["ioreg", "-w0", "-rn", "AppleSmartBattery"])
-            
-            # 2. Parse under lock
-            with self.lock:
-                # Basic Source & Connection
-                ext_conn = '"ExternalConnected" = Yes' in ioreg_out or '"AppleRawExternalConnected" = Yes' in ioreg_out
-                self.data.power_source = 'AC Power' if ext_conn else 'Battery'
-                self.data.charger_connected = ext_conn
-                
-                # Percentage
-                cur_cap = re.search(r'"CurrentCapacity"\s*=\s*(\d+)', ioreg_out)
-                max_cap = re.search(r'"MaxCapacity"\s*=\s*(\d+)', ioreg_out)
-                if cur_cap and max_cap:
-                    self.data.battery_percent = int(cur_cap.group(1))
-                
-                # Charging Status
-                is_charging = '"IsCharging" = Yes' in ioreg_out
-                fully_charged = '"FullyCharged" = Yes' in ioreg_out
-                if fully_charged: self.data.charging_status = 'Fully Charged'
-                elif is_charging: self.data.charging_status = 'Charging'
-                else: self.data.charging_status = 'Discharging' if not ext_conn else 'Connected'
-
-                # Time Remaining
-                t_match = re.search(r'"TimeRemaining"\s*=\s*(\d+)', ioreg_out)
-                if t_match:
-                    mins = int(t_match.group(1))
-                    if mins == 65535: self.data.time_remaining = "Calculating..."
-                    else: self.data.time_remaining = f"{mins // 60}h {mins % 60}m"
-                
-                # Temperature (deciKelvin)
-                match = re.search(r'"Temperature"\s*=\s*(\d+)', ioreg_out)
-                if match: self.data.temperature = round((int(match.group(1)) / 10) - 273.15, 1)
-                
-                # Voltage & Amperage
-                v_match = re.search(r'"Voltage"\s*=\s*(\d+)', ioreg_out)
-                if v_match: self.data.voltage = int(v_match.group(1)) / 1000
-                
-                a_match = re.search(r'"InstantAmperage"\s*=\s*(-?\d+)', ioreg_out)
-                if not a_match: a_match = re.search(r'"Amperage"\s*=\s*(-?\d+)', ioreg_out)
-                
-                if a_match:
-                    amp = int(a_match.group(1))
-                    if amp > 2**63: amp -= 2**64
-                    self.data.amperage = amp
-                
-                self.data.power_watts = round(self.data.voltage * abs(self.data.amperage) / 1000, 2)
-                self.data.power_history.append(self.data.power_watts)
-                
-                # Health & Cycles
-                match = re.search(r'"CycleCount"\s*=\s*(\d+)', ioreg_out)
-                if match: self.data.cycle_count = int(match.group(1))
-                match = re.search(r'"DesignCapacity"\s*=\s*(\d+)', ioreg_out)
-                if match: self.data.design_capacity = int(match.group(1))
-                match = re.search(r'"AppleRawMaxCapacity"\s*=\s*(\d+)', ioreg_out)
-                if match: 
-                    self.data.current_capacity = int(match.group(1))
-                    if self.data.design_capacity > 0:
-                        self.data.max_capacity_percent = round((self.data.current_capacity / self.data.design_capacity) * 100, 1)
-
-                # Charger Details
-                ad_match = re.search(r'"(?:AppleRaw)?AdapterDetails"\s*=\s*\{([^}]+)\}', ioreg_out)
-                if ad_match:
-                    ad_str = ad_match.group(1)
-                    v_match = re.search(r'[ ,]\"?AdapterVoltage\"?[:=](\d+)', " " + ad_str)
-                    if v_match: self.data.adapter_voltage = int(v_match.group(1)) / 1000
-                    c_match = re.search(r'[ ,]\"?Current\"?[:=](\d+)', " " + ad_str)
-                    if c_match: self.data.adapter_current = int(c_match.group(1))
-                    w_match = re.search(r'[ ,]\"?Watts\"?[:=](\d+)', " " + ad_str)
-                    if w_match: self.data.charger_wattage = int(w_match.group(1))
-
-                # Update metadata
-                self.data.poll_latency = round((time.time() - start_time) * 1000, 0)
+            t0 = time.monotonic_ns()
+
+            # 1. Collect: IOKit direct read when available, ioreg otherwise
+            props = self.collect_iokit() if _HAS_IOKIT else None
+            if props is None:
+                props = self.collect_ioreg()
+
+            # 2. Publish under lock, then wake the render loop
+            self.publish(props, t0)
+            self.notify_ui()
 
             # 3. Slow check for Condition & Low Power Mode (every 30s)
-            if time.time() - self.last_slow_check > 30:
-                prof_out = self.run_command(["system_profiler", "SPPowerDataType"])
-                match = re.search(r'Condition:\s*(\w+)', prof_out)
-                
-                # Check low power mode via pmset
-                lpm_out = self.run_command(["pmset", "-g"])
-                
+            if t0 - self.last_slow_check > 30_000_000_000:
+                condition = self.read_condition(props)
+                low_power = self.read_low_power_mode()
+
                 with self.lock:
-                    if match: self.data.condition = match.group(1)
-                    # Look for lowpowermode line
-                    lpm_match = re.search(r'lowpowermode\s+(\d)', lpm_out)
-                    self.data.low_power_mode = (lpm_match.group(1) == '1') if lpm_match else False
-                self.last_slow_check = time.time()
+                    if condition: self.data.condition = condition
+                    self.data.low_power_mode = low_power
+                    self.data.version += 1
+                self.notify_ui()
+                self.last_slow_check = time.monotonic_ns()
 
-            time.sleep(self.data.poll_interval)
+            # Interruptible sleep: a mode change (or quit) wakes us at once
+            # instead of waiting out an up-to-5s ECO interval
+            self._wake.wait(self.data.poll_interval)
+            self._wake.clear()
 
 
 def draw_battery_bar(win, y, x, percent, width=30):
     filled = int((percent / 100) * width)
     empty = width - filled
-    color = curses.color_pair(2) if percent >= 60 else (curses.color_pair(3) if percent >= 30 else curses.color_pair(1))
+    color = _CP2 if percent >= 60 else (_CP3 if percent >= 30 else _CP1)
     win.addstr(y, x, "[")
-    win.addstr("█" * filled, color | curses.A_BOLD)
-    win.addstr("░" * empty, curses.color_pair(8))
+    win.addstr("█" * filled, color | _BOLD)
+    win.addstr("░" * empty, _CP8)
     win.addstr(f"] {percent}%")
 
 
 def draw_power_flow(win, y, x, is_charging, frame):
     if is_charging:
         p = ['⚡ ━━▶━━ ', '━⚡━━▶━━', '━━⚡━▶━━', '━━━⚡▶━━', '━━━━⚡━━']
-        color = curses.color_pair(2)
+        color = _CP2
     else:
         p = ['━━◀━━ ⚡', '━━◀━━⚡━', '━━◀━⚡━━', '━━◀⚡━━━', '━━⚡━━━━']
-        color = curses.color_pair(3)
-    win.addstr(y, x, p[frame % 5], color | curses.A_BOLD)
+        color = _CP3
+    win.addstr(y, x, p[frame % 5], color | _BOLD)
+
+
+def quantize_history(history, g_w, m_v):
+    """Bucket the last g_w samples into 0-7 sparkline levels."""
+    if np is not None:
+        tail = np.ascontiguousarray(history[-g_w:], dtype=np.float32)
+        if _quantize_jit is not None:
+            return _quantize_jit(tail, g_w, 7.0 / m_v)
+        return np.minimum(7, (tail * (7.0 / m_v)).astype(np.int32))
+    return [int((history[-(g_w - i)] / m_v) * 7) for i in range(g_w)]
 
 
 def draw_box(win, y, x, height, width, title=""):
-    win.addstr(y, x, "╭" + "─" * (width - 2) + "╮", curses.color_pair(6))
+    win.addstr(y, x, "╭" + "─" * (width - 2) + "╮", _CP6)
     for i in range(1, height - 1):
-        win.addstr(y + i, x, "│", curses.color_pair(6))
-        win.addstr(y + i, x + width - 1, "│", curses.color_pair(6))
-    win.addstr(y + height - 1, x, "╰" + "─" * (width - 2) + "╯", curses.color_pair(6))
+        win.addstr(y + i, x, "│", _CP6)
+        win.addstr(y + i, x + width - 1, "│", _CP6)
+    win.addstr(y + height - 1, x, "╰" + "─" * (width - 2) + "╯", _CP6)
     if title:
         t = f" {title} "
-        win.addstr(y, x + (width - len(t)) // 2, t, curses.color_pair(5) | curses.A_BOLD)
+        win.addstr(y, x + (width - len(t)) // 2, t, _CP5 | _BOLD)
 
 
 def main_loop(stdscr):
+    global _CP1, _CP2, _CP3, _CP4, _CP5, _CP6, _CP8
+
     curses.curs_set(0)
     curses.start_color()
     curses.use_default_colors()
-    
+
     # Colors
     curses.init_pair(1, curses.COLOR_RED, -1)
     curses.init_pair(2, curses.COLOR_GREEN, -1)
@@ -215,122 +544,173 @@ def main_loop(stdscr):
     curses.init_pair(5, curses.COLOR_WHITE, -1)
     curses.init_pair(6, curses.COLOR_BLUE, -1)
     curses.init_pair(8, 240, -1) # Dark gray
-    
+
+    # Resolve color-pair attributes once for the whole session
+    _CP1 = curses.color_pair(1)
+    _CP2 = curses.color_pair(2)
+    _CP3 = curses.color_pair(3)
+    _CP4 = curses.color_pair(4)
+    _CP5 = curses.color_pair(5)
+    _CP6 = curses.color_pair(6)
+    _CP8 = curses.color_pair(8)
+
     stdscr.nodelay(True)
-    stdscr.timeout(200) # Fast UI refresh (5Hz)
-    
+
     data = PowerData()
     lock = threading.Lock()
-    collector = DataCollector(data, lock)
+
+    # Wake pipe: the collector writes a byte after each publish so this
+    # loop can sleep in select() on stdin + pipe instead of busy-polling
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    collector = DataCollector(data, lock, wake_fd=wake_w)
     collector.start()
-    
+
+    def wait_for_event(timeout=0.05):
+        """Sleep until a keypress, fresh data, or the next animation tick."""
+        ready, _, _ = select.select([sys.stdin.fileno(), wake_r], [], [], timeout)
+        if wake_r in ready:
+            try:
+                os.read(wake_r, 64)  # drain
+            except OSError:
+                pass
+
     frame = 0
-    
+    last_version = -1
+    last_size = (0, 0)
+
     while True:
         key = stdscr.getch()
         if key == ord('q') or key == ord('Q'):
             collector.running = False
+            collector.wake()
             break
         elif key == ord('e') or key == ord('E'):
             with lock:
                 data.mode = "ECO"
                 data.poll_interval = 5.0
+                data.version += 1
+            collector.wake()
         elif key == ord('b') or key == ord('B'):
             with lock:
                 data.mode = "BALANCED"
                 data.poll_interval = 2.0
+                data.version += 1
+            collector.wake()
         elif key == ord('p') or key == ord('P'):
             with lock:
                 data.mode = "PERFORMANCE"
                 data.poll_interval = 0.5
-            
+                data.version += 1
+            collector.wake()
+
         max_y, max_x = stdscr.getmaxyx()
         if max_x < 70 or max_y < 25:
-            stdscr.clear()
-            stdscr.addstr(0, 0, "Terminal too small (min 70x25)", curses.color_pair(1))
-            stdscr.refresh()
+            stdscr.erase()
+            stdscr.addstr(0, 0, "Terminal too small (min 70x25)", _CP1)
+            stdscr.noutrefresh()
+            curses.doupdate()
+            wait_for_event(0.2)
             continue
 
+        # Lock-free fast path: version and is_active_charge are plain
+        # attribute reads (atomic in CPython), so ticking the power-flow
+        # animation doesn't need the lock at all
+        if data.version == last_version and (max_y, max_x) == last_size:
+            draw_power_flow(stdscr, 5, 20, data.is_active_charge, frame)
+            stdscr.noutrefresh()
+            curses.doupdate()
+            frame += 1
+            wait_for_event()
+            continue
+
+        # Hold the lock only long enough to copy; render from the snapshot
+        # so the collector is never stalled behind a redraw
         with lock:
-            stdscr.clear()
-            
-            # Header
-            stdscr.addstr(0, (max_x - 35) // 2, "⚡ MAC VOLT MONITOR ⚡", curses.color_pair(4) | curses.A_BOLD)
-            mode_color = curses.color_pair(2) if data.mode == "ECO" else (curses.color_pair(3) if data.mode == "BALANCED" else curses.color_pair(1))
-            stdscr.addstr(1, (max_x - 20) // 2, f"Mode: {data.mode}", mode_color | curses.A_BOLD)
-            
-            # --- POWER SOURCE ---
-            draw_box(stdscr, 2, 2, 6, 66, "⚡ POWER SOURCE")
-            source_icon = "🔌" if data.power_source == 'AC Power' else "🔋"
-            source_color = curses.color_pair(2) if data.power_source == 'AC Power' else curses.color_pair(3)
-            stdscr.addstr(3, 4, "Source:", curses.color_pair(5))
-            stdscr.addstr(3, 20, f"{source_icon} {data.power_source}", source_color | curses.A_BOLD)
-            stdscr.addstr(4, 4, "Status:", curses.color_pair(5))
-            stdscr.addstr(4, 20, data.charging_status, curses.color_pair(5))
-            stdscr.addstr(5, 4, "Flow:", curses.color_pair(5))
-            is_active_charge = data.charging_status == 'Charging' or data.amperage > 50
-            draw_power_flow(stdscr, 5, 20, is_active_charge, frame)
-            
-            # --- BATTERY ---
-            draw_box(stdscr, 9, 2, 7, 66, "🔋 BATTERY STATUS")
-            draw_battery_bar(stdscr, 10, 4, data.battery_percent, 35)
-            health_color = curses.color_pair(2) if data.max_capacity_percent >= 80 else curses.color_pair(3)
-            stdscr.addstr(11, 4, "Health:", curses.color_pair(5))
-            stdscr.addstr(11, 20, f"{data.max_capacity_percent}% of design", health_color)
-            stdscr.addstr(12, 4, "Condition:", curses.color_pair(5))
-            stdscr.addstr(12, 20, data.condition, curses.color_pair(2) if 'Normal' in data.condition else curses.color_pair(3))
-            stdscr.addstr(13, 4, "Cycles:", curses.color_pair(5))
-            stdscr.addstr(13, 20, f"{data.cycle_count} cycles", curses.color_pair(5))
-            stdscr.addstr(14, 4, "Time Left:", curses.color_pair(5))
-            stdscr.addstr(14, 20, data.time_remaining, curses.color_pair(4) | curses.A_BOLD)
-
-            # --- METRICS & CHARGER ---
-            draw_box(stdscr, 17, 2, 6, 32, "📊 METRICS")
-            p_color = curses.color_pair(2) if data.amperage >= 0 else curses.color_pair(3)
-            stdscr.addstr(18, 4, "Power:", curses.color_pair(5))
-            stdscr.addstr(18, 14, f"{'↓' if data.amperage >=0 else '↑'} {data.power_watts}W", p_color | curses.A_BOLD)
-            stdscr.addstr(19, 4, "Current:", curses.color_pair(5))
-            stdscr.addstr(19, 14, f"{abs(data.amperage)}mA", curses.color_pair(5))
-            stdscr.addstr(20, 4, "Voltage:", curses.color_pair(5))
-            stdscr.addstr(20, 14, f"{data.voltage:.2f}V", curses.color_pair(5))
-            t_color = curses.color_pair(2) if data.temperature < 40 else curses.color_pair(1)
-            stdscr.addstr(21, 4, "Temp:", curses.color_pair(5))
-            stdscr.addstr(21, 14, f"{data.temperature}°C", t_color)
-
-            if data.charger_connected:
-                draw_box(stdscr, 17, 36, 6, 32, "🔌 CHARGER")
-                stdscr.addstr(18, 38, "Wattage:", curses.color_pair(5))
-                stdscr.addstr(18, 50, f"{data.charger_wattage}W", curses.color_pair(2) | curses.A_BOLD)
-                stdscr.addstr(19, 38, "Adapter V:", curses.color_pair(5))
-                stdscr.addstr(19, 50, f"{data.adapter_voltage:.1f}V", curses.color_pair(5))
-                stdscr.addstr(20, 38, "Adapter I:", curses.color_pair(5))
-                stdscr.addstr(20, 50, f"{data.adapter_current}mA", curses.color_pair(5))
-                stdscr.addstr(21, 38, "Low Power:", curses.color_pair(5))
-                stdscr.addstr(21, 50, "ON" if data.low_power_mode else "OFF", curses.color_pair(3) if data.low_power_mode else curses.color_pair(8))
-
-            # --- GRAPH ---
-            if max_y > 28:
-                draw_box(stdscr, 24, 2, 4, 66, "📈 POWER HISTORY")
-                history = list(data.power_history)
-                if history:
-                    m_v = max(history) if max(history) > 0 else 1
-                    chars = [' ', '▂', '▃', '▄', '▅', '▆', '▇', '█']
-                    g_w = min(60, len(history))
-                    for i in range(g_w):
-                        v = history[-(g_w-i)]
-                        c_idx = int((v/m_v) * 7)
-                        stdscr.addstr(26, 4 + i, chars[c_idx], curses.color_pair(4))
-
-            # Footer
-            footer = f" [P]erf | [B]alanced | [E]co | 'q' to quit  "
-            stdscr.addstr(max_y-2, (max_x - len(footer)) // 2, footer, curses.color_pair(5))
-            
-            meta = f" Poll: {data.poll_latency}ms | Interval: {data.poll_interval}s "
-            stdscr.addstr(max_y-1, (max_x - len(meta)) // 2, meta, curses.color_pair(8))
-
-        stdscr.refresh()
+            snap = data.snapshot()
+
+        is_active_charge = snap.is_active_charge
+        last_version = snap.version
+        last_size = (max_y, max_x)
+
+        stdscr.erase()
+
+        # Header
+        stdscr.addstr(0, (max_x - 35) // 2, "⚡ MAC VOLT MONITOR ⚡", _CP4 | _BOLD)
+        mode_color = _CP2 if snap.mode == "ECO" else (_CP3 if snap.mode == "BALANCED" else _CP1)
+        stdscr.addstr(1, (max_x - 20) // 2, f"Mode: {snap.mode}", mode_color | _BOLD)
+
+        # --- POWER SOURCE ---
+        draw_box(stdscr, 2, 2, 6, 66, "⚡ POWER SOURCE")
+        source_icon = "🔌" if snap.power_source == 'AC Power' else "🔋"
+        source_color = _CP2 if snap.power_source == 'AC Power' else _CP3
+        stdscr.addstr(3, 4, "Source:", _CP5)
+        stdscr.addstr(3, 20, f"{source_icon} {snap.power_source}", source_color | _BOLD)
+        stdscr.addstr(4, 4, "Status:", _CP5)
+        stdscr.addstr(4, 20, snap.charging_status, _CP5)
+        stdscr.addstr(5, 4, "Flow:", _CP5)
+        draw_power_flow(stdscr, 5, 20, is_active_charge, frame)
+
+        # --- BATTERY ---
+        draw_box(stdscr, 9, 2, 7, 66, "🔋 BATTERY STATUS")
+        draw_battery_bar(stdscr, 10, 4, snap.battery_percent, 35)
+        health_color = _CP2 if snap.max_capacity_percent >= 80 else _CP3
+        stdscr.addstr(11, 4, "Health:", _CP5)
+        stdscr.addstr(11, 20, f"{snap.max_capacity_percent}% of design", health_color)
+        stdscr.addstr(12, 4, "Condition:", _CP5)
+        stdscr.addstr(12, 20, snap.condition, _CP2 if 'Normal' in snap.condition else _CP3)
+        stdscr.addstr(13, 4, "Cycles:", _CP5)
+        stdscr.addstr(13, 20, f"{snap.cycle_count} cycles", _CP5)
+        stdscr.addstr(14, 4, "Time Left:", _CP5)
+        stdscr.addstr(14, 20, snap.time_remaining, _CP4 | _BOLD)
+
+        # --- METRICS & CHARGER ---
+        draw_box(stdscr, 17, 2, 6, 32, "📊 METRICS")
+        p_color = _CP2 if snap.amperage >= 0 else _CP3
+        stdscr.addstr(18, 4, "Power:", _CP5)
+        stdscr.addstr(18, 14, f"{'↓' if snap.amperage >=0 else '↑'} {snap.power_watts}W", p_color | _BOLD)
+        stdscr.addstr(19, 4, "Current:", _CP5)
+        stdscr.addstr(19, 14, f"{abs(snap.amperage)}mA", _CP5)
+        stdscr.addstr(20, 4, "Voltage:", _CP5)
+        stdscr.addstr(20, 14, f"{snap.voltage:.2f}V", _CP5)
+        t_color = _CP2 if snap.temperature < 40 else _CP1
+        stdscr.addstr(21, 4, "Temp:", _CP5)
+        stdscr.addstr(21, 14, f"{snap.temperature}°C", t_color)
+
+        if snap.charger_connected:
+            draw_box(stdscr, 17, 36, 6, 32, "🔌 CHARGER")
+            stdscr.addstr(18, 38, "Wattage:", _CP5)
+            stdscr.addstr(18, 50, f"{snap.charger_wattage}W", _CP2 | _BOLD)
+            stdscr.addstr(19, 38, "Adapter V:", _CP5)
+            stdscr.addstr(19, 50, f"{snap.adapter_voltage:.1f}V", _CP5)
+            stdscr.addstr(20, 38, "Adapter I:", _CP5)
+            stdscr.addstr(20, 50, f"{snap.adapter_current}mA", _CP5)
+            stdscr.addstr(21, 38, "Low Power:", _CP5)
+            stdscr.addstr(21, 50, "ON" if snap.low_power_mode else "OFF", _CP3 if snap.low_power_mode else _CP8)
+
+        # --- GRAPH ---
+        if max_y > 28:
+            draw_box(stdscr, 24, 2, 4, 66, "📈 POWER HISTORY")
+            history = snap.power_history_ordered()
+            if len(history):
+                m_v = float(history.max()) if np is not None else max(history)
+                if m_v <= 0: m_v = 1
+                g_w = min(60, len(history))
+                buckets = quantize_history(history, g_w, m_v)
+                # One addstr for the whole row instead of one per cell
+                row = "".join(_SPARK_CHARS[b] for b in buckets)
+                stdscr.addstr(26, 4, row, _CP4)
+
+        # Footer
+        stdscr.addstr(max_y-2, (max_x - len(_FOOTER)) // 2, _FOOTER, _CP5)
+
+        meta = f" Poll: {snap.poll_latency}ms | Interval: {snap.poll_interval}s "
+        stdscr.addstr(max_y-1, (max_x - len(meta)) // 2, meta, _CP8)
+
+        stdscr.noutrefresh()
+        curses.doupdate()
         frame += 1
-        time.sleep(0.05) # Cap UI refresh to ~20FPS
+        wait_for_event() # Cap UI refresh to ~20FPS, but wake early on events
 
 
 def main():
@@ -342,6 +722,11 @@ def main():
         print(out)
         return
 
+    # Warm the JIT cache before the UI starts so the first frame doesn't
+    # pay for compilation
+    if _quantize_jit is not None:
+        _quantize_jit(np.zeros(1, dtype=np.float32), 1, 1.0)
+
     try:
         curses.wrapper(main_loop)
     except KeyboardInterrupt: